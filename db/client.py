@@ -1,12 +1,23 @@
+import asyncio
 from dataclasses import dataclass
 from typing import Any
 import os
 
+from async_lru import alru_cache
 from dotenv import load_dotenv
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncGraphDatabase, AsyncDriver, Record, RoutingControl
 
 load_dotenv()
 
+# Dashboard stats change at human timescales; absorb refresh bursts in memory.
+STATS_CACHE_TTL = 30
+
+INDEXES = (
+    "CREATE INDEX decision_ai_influence IF NOT EXISTS FOR (d:Decision) ON (d.ai_influence)",
+    "CREATE INDEX outcome_type IF NOT EXISTS FOR (o:Outcome) ON (o.type)",
+    "CREATE INDEX decision_name IF NOT EXISTS FOR (d:Decision) ON (d.name)",
+)
+
 
 @dataclass
 class Neo4jConfig:
@@ -14,6 +25,7 @@ class Neo4jConfig:
     user: str
     password: str
     database: str
+    max_connection_pool_size: int = 50
 
     @classmethod
     def from_env(cls) -> "Neo4jConfig":
@@ -22,81 +34,131 @@ class Neo4jConfig:
             user=os.getenv("NEO4J_USER", "neo4j"),
             password=os.getenv("NEO4J_PASSWORD", ""),
             database=os.getenv("NEO4J_DATABASE", "neo4j"),
+            max_connection_pool_size=int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "50")),
         )
 
 
 class Neo4jClient:
     def __init__(self, config: Neo4jConfig | None = None):
         self.config = config or Neo4jConfig.from_env()
-        self._driver: Driver | None = None
+        self._driver: AsyncDriver | None = None
+        self._indexes_ensured = False
+        # One slot per pooled connection: excess queries queue here instead of
+        # timing out on connection acquisition inside the driver.
+        self._query_slots = asyncio.Semaphore(self.config.max_connection_pool_size)
 
     @property
-    def driver(self) -> Driver:
+    def driver(self) -> AsyncDriver:
         if self._driver is None:
-            self._driver = GraphDatabase.driver(
+            self._driver = AsyncGraphDatabase.driver(
                 self.config.uri,
                 auth=(self.config.user, self.config.password),
+                max_connection_pool_size=self.config.max_connection_pool_size,
             )
         return self._driver
 
-    def close(self) -> None:
+    async def close(self) -> None:
         if self._driver:
-            self._driver.close()
+            await self._driver.close()
             self._driver = None
 
-    def query(self, cypher: str, parameters: dict[str, Any] | None = None) -> list[dict[str, Any]]:
-        with self.driver.session(database=self.config.database) as session:
-            result = session.run(cypher, parameters or {})
-            return [record.data() for record in result]
+    async def _execute(
+        self, cypher: str, parameters: dict[str, Any] | None, routing: RoutingControl
+    ) -> list[Record]:
+        # Naming the database skips the home-database lookup on every call.
+        async with self._query_slots:
+            records, _, _ = await self.driver.execute_query(
+                cypher,
+                parameters or {},
+                database_=self.config.database,
+                routing_=routing,
+            )
+        return records
 
-    def get_decisions(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (d:Decision) RETURN d LIMIT $limit", {"limit": limit})
+    async def query(
+        self,
+        cypher: str,
+        parameters: dict[str, Any] | None = None,
+        routing: RoutingControl = RoutingControl.READ,
+    ) -> list[dict[str, Any]]:
+        records = await self._execute(cypher, parameters, routing)
+        return [record.data() for record in records]
 
-    def get_events(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (e:Event) RETURN e LIMIT $limit", {"limit": limit})
+    async def query_one_row(
+        self,
+        cypher: str,
+        parameters: dict[str, Any] | None = None,
+        routing: RoutingControl = RoutingControl.READ,
+    ) -> Record | None:
+        # Records are tuples indexable by position or key; skip the dict copy.
+        records = await self._execute(cypher, parameters, routing)
+        return records[0] if records else None
 
-    def get_outcomes(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (o:Outcome) RETURN o LIMIT $limit", {"limit": limit})
+    async def ensure_indexes(self) -> None:
+        if self._indexes_ensured:
+            return
+        for statement in INDEXES:
+            await self.query(statement, routing=RoutingControl.WRITE)
+        self._indexes_ensured = True
 
-    def get_people(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (p:Person) RETURN p LIMIT $limit", {"limit": limit})
+    async def get_decisions(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (d:Decision) RETURN d LIMIT $limit", {"limit": limit})
 
-    def get_agents(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (a:Agent) RETURN a LIMIT $limit", {"limit": limit})
+    async def get_events(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (e:Event) RETURN e LIMIT $limit", {"limit": limit})
 
-    def get_people_with_stats(self, limit: int = 50) -> list[dict[str, Any]]:
-        return self.query("""
-            MATCH (p:Person)
-            OPTIONAL MATCH (p)-[:PARTICIPATED_IN]->(d:Decision)
-            WITH p, count(d) as decision_count
-            RETURN p.name as name, p.role as role, decision_count
-            ORDER BY decision_count DESC
-            LIMIT $limit
-        """, {"limit": limit})
+    async def get_outcomes(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (o:Outcome) RETURN o LIMIT $limit", {"limit": limit})
 
-    def get_agents_with_stats(self, limit: int = 50) -> list[dict[str, Any]]:
-        return self.query("""
-            MATCH (a:Agent)
-            OPTIONAL MATCH (a)-[:PARTICIPATED_IN]->(d:Decision)
-            WITH a, count(d) as decision_count
-            RETURN a.name as name, a.description as description, decision_count
-            ORDER BY decision_count DESC
-            LIMIT $limit
+    async def get_people(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (p:Person) RETURN p LIMIT $limit", {"limit": limit})
+
+    async def get_agents(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (a:Agent) RETURN a LIMIT $limit", {"limit": limit})
+
+    @alru_cache(maxsize=32, ttl=STATS_CACHE_TTL)
+    async def get_contributors_with_stats(self, limit: int = 50) -> dict[str, list[dict[str, Any]]]:
+        result = await self.query("""
+            CALL {
+                MATCH (p:Person)
+                OPTIONAL MATCH (p)-[:PARTICIPATED_IN]->(d:Decision)
+                WITH p, count(d) as decision_count
+                ORDER BY decision_count DESC
+                LIMIT $limit
+                RETURN collect({name: p.name, role: p.role, decision_count: decision_count}) as people
+            }
+            CALL {
+                MATCH (a:Agent)
+                OPTIONAL MATCH (a)-[:PARTICIPATED_IN]->(d:Decision)
+                WITH a, count(d) as decision_count
+                ORDER BY decision_count DESC
+                LIMIT $limit
+                RETURN collect({name: a.name, description: a.description, decision_count: decision_count}) as agents
+            }
+            RETURN people, agents
         """, {"limit": limit})
+        return result[0] if result else {"people": [], "agents": []}
+
+    async def get_people_with_stats(self, limit: int = 50) -> list[dict[str, Any]]:
+        return (await self.get_contributors_with_stats(limit))["people"]
 
-    def get_tasks(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.query("MATCH (t:Task) RETURN t LIMIT $limit", {"limit": limit})
+    async def get_agents_with_stats(self, limit: int = 50) -> list[dict[str, Any]]:
+        return (await self.get_contributors_with_stats(limit))["agents"]
 
-    def get_decisions_by_influence(self, influence_type: str) -> int:
-        result = self.query(
-            "MATCH (d:Decision) WHERE d.ai_influence = $influenceType RETURN count(d) AS DecisionCount",
+    async def get_tasks(self, limit: int = 100) -> list[dict[str, Any]]:
+        return await self.query("MATCH (t:Task) RETURN t LIMIT $limit", {"limit": limit})
+
+    async def get_decisions_by_influence(self, influence_type: str) -> int:
+        row = await self.query_one_row(
+            "RETURN count { (d:Decision) WHERE d.ai_influence = $influenceType } AS DecisionCount",
             {"influenceType": influence_type}
         )
-        return result[0]["DecisionCount"] if result else 0
+        return row[0] if row is not None else 0
 
-    def get_decision_influence_stats(self) -> dict[str, Any]:
-        high_count = self.get_decisions_by_influence("high")
-        low_count = self.get_decisions_by_influence("low")
+    async def get_decision_influence_stats(self) -> dict[str, Any]:
+        counts = await self.get_all_counts()
+        high_count = counts["high_influence"]
+        low_count = counts["low_influence"]
         total = high_count + low_count
         return {
             "high": high_count,
@@ -106,28 +168,31 @@ class Neo4jClient:
             "low_rate": (low_count / total * 100) if total > 0 else 0,
         }
 
-    def get_dashboard_stats(self) -> dict[str, Any]:
-        result = self.query("""
-            MATCH (d:Decision)
-            WITH count(d) as total_decisions
-            
-            OPTIONAL MATCH (d2:Decision)-[:LED_TO]->(o:Outcome)
-            WHERE o.type = 'good'
-            WITH total_decisions, count(DISTINCT d2) as good_outcomes
-            
-            OPTIONAL MATCH (d3:Decision)-[:LED_TO]->(o2:Outcome)
-            WHERE o2.type = 'bad'
-            WITH total_decisions, good_outcomes, count(DISTINCT d3) as bad_outcomes
-            
-            OPTIONAL MATCH (d4:Decision)<-[:CONTRIBUTED_TO]-(p:Person)
-            WITH total_decisions, good_outcomes, bad_outcomes, count(DISTINCT d4) as human_decisions
-            
-            OPTIONAL MATCH (d5:Decision)<-[:CONTRIBUTED_TO]-(a:Agent)
-            RETURN total_decisions, good_outcomes, bad_outcomes, human_decisions, count(DISTINCT d5) as ai_decisions
+    async def get_dashboard_stats(self) -> dict[str, Any]:
+        r = await self.query_one_row("""
+            CALL { MATCH (d:Decision) RETURN count(d) as total_decisions }
+            CALL {
+                MATCH (d:Decision)-[:LED_TO]->(o:Outcome)
+                WHERE o.type = 'good'
+                RETURN count(DISTINCT d) as good_outcomes
+            }
+            CALL {
+                MATCH (d:Decision)-[:LED_TO]->(o:Outcome)
+                WHERE o.type = 'bad'
+                RETURN count(DISTINCT d) as bad_outcomes
+            }
+            CALL {
+                MATCH (d:Decision)<-[:CONTRIBUTED_TO]-(:Person)
+                RETURN count(DISTINCT d) as human_decisions
+            }
+            CALL {
+                MATCH (d:Decision)<-[:CONTRIBUTED_TO]-(:Agent)
+                RETURN count(DISTINCT d) as ai_decisions
+            }
+            RETURN total_decisions, good_outcomes, bad_outcomes, human_decisions, ai_decisions
         """)
         
-        if result:
-            r = result[0]
+        if r is not None:
             total = r["total_decisions"]
             good = r["good_outcomes"]
             bad = r["bad_outcomes"]
@@ -151,43 +216,42 @@ class Neo4jClient:
             "ai_decisions": 0,
         }
 
-    def get_decisions_by_type(self, per_type: int = 4) -> list[dict[str, Any]]:
-        return self.query("""
+    @alru_cache(maxsize=32, ttl=STATS_CACHE_TTL)
+    async def get_decisions_by_type(self, per_type: int = 4) -> list[dict[str, Any]]:
+        return await self.query("""
             MATCH (d:Decision)
             WHERE d.name IS NOT NULL
+            WITH d,
+                 EXISTS { (:Person)-[:PARTICIPATED_IN]->(d) } as hp,
+                 EXISTS { (:Agent)-[:PARTICIPATED_IN]->(d) } as ha
+            WITH d,
+                 CASE WHEN ha AND hp THEN 0
+                      WHEN hp THEN 1
+                      WHEN ha THEN 2
+                      ELSE 3 END as influence_rank
+            ORDER BY influence_rank, d.name
+            WITH influence_rank, collect(d)[0..$per_type] as ds
+            UNWIND ds as d
             OPTIONAL MATCH (p:Person)-[:PARTICIPATED_IN]->(d)
             OPTIONAL MATCH (a:Agent)-[:PARTICIPATED_IN]->(d)
-            OPTIONAL MATCH (d)-[:CONTRIBUTED_TO*1..2]->(x)<-[:CAUSED_BY]-(o:Outcome)
-            WHERE x IS NULL OR x:Task OR x:Event
-            WITH d, 
-                 collect(DISTINCT p.name) as people, 
-                 collect(DISTINCT a.name) as agents,
-                 collect(DISTINCT o.name)[0] as outcome,
-                 CASE WHEN size(collect(DISTINCT a)) > 0 AND size(collect(DISTINCT p)) > 0 THEN 'both'
-                      WHEN size(collect(DISTINCT a)) > 0 THEN 'ai' 
-                      WHEN size(collect(DISTINCT p)) > 0 THEN 'human' 
-                      ELSE 'unknown' END as influence_type
-            WITH d.name as decision, d.description as description, outcome,
-                 [x IN people WHERE x IS NOT NULL] as people,
-                 [x IN agents WHERE x IS NOT NULL] as agents,
-                 influence_type
-            ORDER BY CASE influence_type WHEN 'both' THEN 0 WHEN 'human' THEN 1 WHEN 'ai' THEN 2 ELSE 3 END, decision
-            WITH influence_type, collect({
-                decision: decision,
-                description: description,
-                outcome: outcome,
-                people: people,
-                agents: agents,
-                influence_type: influence_type
-            })[0..$per_type] as decisions
-            UNWIND decisions as d
-            RETURN d.decision as decision, d.description as description,
-                   d.outcome as outcome, d.people as people, d.agents as agents,
-                   d.influence_type as influence_type
+            WITH influence_rank, d,
+                 collect(DISTINCT p.name) as people,
+                 collect(DISTINCT a.name) as agents
+            OPTIONAL MATCH (d)-[:CONTRIBUTED_TO]->(x1)<-[:CAUSED_BY]-(o1:Outcome)
+            WHERE x1:Task OR x1:Event
+            OPTIONAL MATCH (d)-[:CONTRIBUTED_TO]->()-[:CONTRIBUTED_TO]->(x2)<-[:CAUSED_BY]-(o2:Outcome)
+            WHERE x2:Task OR x2:Event
+            WITH influence_rank, d, people, agents,
+                 collect(DISTINCT o1.name) + collect(DISTINCT o2.name) as outcomes
+            RETURN d.name as decision, d.description as description,
+                   outcomes[0] as outcome, people, agents,
+                   ['both', 'human', 'ai', 'unknown'][influence_rank] as influence_type
+            ORDER BY influence_rank, decision
         """, {"per_type": per_type})
 
-    def get_outcomes_for_summary(self, limit: int = 20) -> list[dict[str, Any]]:
-        return self.query("""
+    @alru_cache(maxsize=32, ttl=STATS_CACHE_TTL)
+    async def get_outcomes_for_summary(self, limit: int = 20) -> list[dict[str, Any]]:
+        return await self.query("""
             MATCH (o:Outcome)
             OPTIONAL MATCH (o)<-[:CAUSED_BY*1..3]-(x)
             WHERE x:Task OR x:Event OR x:Decision
@@ -202,85 +266,67 @@ class Neo4jClient:
             LIMIT $limit
         """, {"limit": limit})
 
-    def get_contribution_split(self) -> dict[str, Any]:
-        decision_result = self.query("""
+    @alru_cache(maxsize=32, ttl=STATS_CACHE_TTL)
+    async def get_contribution_split(self) -> dict[str, Any]:
+        result = await self.query("""
             MATCH (d:Decision)
-            OPTIONAL MATCH (p:Person)-[:PARTICIPATED_IN]->(d)
-            OPTIONAL MATCH (a:Agent)-[:PARTICIPATED_IN]->(d)
-            WITH d,
-                 CASE WHEN a IS NOT NULL AND p IS NOT NULL THEN 'both'
-                      WHEN a IS NOT NULL THEN 'ai'
-                      WHEN p IS NOT NULL THEN 'human'
-                      ELSE 'none' END as contributor_type
-            RETURN contributor_type, count(DISTINCT d) as count
+            WITH EXISTS { (:Person)-[:PARTICIPATED_IN]->(d) } as hp,
+                 EXISTS { (:Agent)-[:PARTICIPATED_IN]->(d) } as ha
+            RETURN sum(CASE WHEN hp AND ha THEN 1 ELSE 0 END) as d_both,
+                   sum(CASE WHEN ha AND NOT hp THEN 1 ELSE 0 END) as d_ai,
+                   sum(CASE WHEN hp AND NOT ha THEN 1 ELSE 0 END) as d_human,
+                   sum(CASE WHEN NOT hp AND NOT ha THEN 1 ELSE 0 END) as d_none
         """)
-        
-        outcome_result = self.query("""
-            MATCH (o:Outcome)<-[:CAUSED_BY]-(x)<-[:CONTRIBUTED_TO*1..2]-(d:Decision)
-            WHERE x:Task OR x:Event
-            OPTIONAL MATCH (p:Person)-[:PARTICIPATED_IN]->(d)
-            OPTIONAL MATCH (a:Agent)-[:PARTICIPATED_IN]->(d)
-            WITH o,
-                 CASE WHEN a IS NOT NULL AND p IS NOT NULL THEN 'both'
-                      WHEN a IS NOT NULL THEN 'ai'
-                      WHEN p IS NOT NULL THEN 'human'
-                      ELSE 'none' END as contributor_type
-            RETURN contributor_type, count(DISTINCT o) as count
-        """)
-        
-        decisions = {"human": 0, "ai": 0, "both": 0, "none": 0, "total": 0}
-        for row in decision_result:
-            decisions[row["contributor_type"]] = row["count"]
-            decisions["total"] += row["count"]
-        
-        outcomes = {"human": 0, "ai": 0, "both": 0, "none": 0, "total": 0}
-        for row in outcome_result:
-            outcomes[row["contributor_type"]] = row["count"]
-            outcomes["total"] += row["count"]
-        
-        total = decisions["total"] or 1
+
+        r = result[0] if result else {}
+        decisions = {kind: r.get(f"d_{kind}", 0) for kind in ("human", "ai", "both", "none")}
+        decision_total = sum(decisions.values())
+
+        total = decision_total or 1
         return {
             "human_only": decisions["human"],
             "ai_only": decisions["ai"],
             "both": decisions["both"],
             "none": decisions["none"],
-            "total": decisions["total"],
+            "total": decision_total,
             "human_only_rate": decisions["human"] / total * 100,
             "ai_only_rate": decisions["ai"] / total * 100,
             "both_rate": decisions["both"] / total * 100,
             "none_rate": decisions["none"] / total * 100,
         }
 
-    def get_dashboard_summary(self) -> dict[str, Any]:
-        result = self.query("""
-            MATCH (d:Decision) WITH count(d) as total_decisions
-            MATCH (o:Outcome) WITH total_decisions, count(o) as total_outcomes
-            MATCH (p:Person) WITH total_decisions, total_outcomes, count(p) as total_people
-            MATCH (a:Agent) 
-            RETURN total_decisions, total_outcomes, total_people, count(a) as total_agents
+    @alru_cache(maxsize=32, ttl=STATS_CACHE_TTL)
+    async def get_all_counts(self) -> dict[str, int]:
+        result = await self.query("""
+            RETURN count { (:Decision) } as decisions,
+                   count { (:Event) } as events,
+                   count { (:Outcome) } as outcomes,
+                   count { (:Person) } as people,
+                   count { (:Agent) } as agents,
+                   count { (:Task) } as tasks,
+                   count { (d:Decision) WHERE d.ai_influence = 'high' } as high_influence,
+                   count { (d:Decision) WHERE d.ai_influence = 'low' } as low_influence
         """)
-        
-        t = result[0] if result else {}
+        return result[0] if result else {
+            "decisions": 0, "events": 0, "outcomes": 0,
+            "people": 0, "agents": 0, "tasks": 0,
+            "high_influence": 0, "low_influence": 0,
+        }
+
+    async def get_dashboard_summary(self) -> dict[str, Any]:
+        counts = await self.get_all_counts()
         return {
-            "total_decisions": t.get("total_decisions", 0),
-            "total_outcomes": t.get("total_outcomes", 0),
-            "total_people": t.get("total_people", 0),
-            "total_agents": t.get("total_agents", 0),
+            "total_decisions": counts["decisions"],
+            "total_outcomes": counts["outcomes"],
+            "total_people": counts["people"],
+            "total_agents": counts["agents"],
         }
 
-    def get_topology_stats(self) -> dict[str, int]:
-        result = self.query("""
-            MATCH (d:Decision) WITH count(d) as decisions
-            MATCH (e:Event) WITH decisions, count(e) as events
-            MATCH (o:Outcome) WITH decisions, events, count(o) as outcomes
-            MATCH (p:Person) WITH decisions, events, outcomes, count(p) as people
-            MATCH (a:Agent) WITH decisions, events, outcomes, people, count(a) as agents
-            MATCH (t:Task) 
-            RETURN decisions, events, outcomes, people, agents, count(t) as tasks
-        """)
-        return result[0] if result else {
-            "decisions": 0, "events": 0, "outcomes": 0,
-            "people": 0, "agents": 0, "tasks": 0
+    async def get_topology_stats(self) -> dict[str, int]:
+        counts = await self.get_all_counts()
+        return {
+            key: counts[key]
+            for key in ("decisions", "events", "outcomes", "people", "agents", "tasks")
         }
 
 
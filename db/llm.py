@@ -1,38 +1,48 @@
+import hashlib
 import os
 
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 load_dotenv()
 
-_client: OpenAI | None = None
+_client: AsyncOpenAI | None = None
+_summary_cache: TTLCache[str, str] = TTLCache(maxsize=128, ttl=600)
 
 
-def get_openai_client() -> OpenAI:
+def get_openai_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = OpenAI(
+        _client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=os.getenv("OPENROUTER_API_KEY"),
         )
     return _client
 
 
-def summarize_outcomes(outcomes: list[dict]) -> str:
+async def summarize_outcomes(outcomes: list[dict]) -> str:
     if not outcomes:
         return "No outcomes to summarize."
 
-    outcomes_text = "\n".join(
-        [
+    lines: list[str] = []
+    append = lines.append
+    for o in outcomes:
+        decisions = [d for d in o.get("decisions") or () if d]
+        append(
             f"- {o.get('outcome', 'Unknown outcome')}: {o.get('description', 'No description')} "
-            f"(from decisions: {', '.join(filter(None, o.get('decisions', []))) or 'unknown'})"
-            for o in outcomes
-        ]
-    )
+            f"(from decisions: {', '.join(decisions) or 'unknown'})"
+        )
+    outcomes_text = "\n".join(lines)
+
+    key = hashlib.blake2b(outcomes_text.encode(), digest_size=16).hexdigest()
+    cached = _summary_cache.get(key)
+    if cached is not None:
+        return cached
 
     client = get_openai_client()
 
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="openai/gpt-4.1-nano",
         messages=[
             {
@@ -48,4 +58,7 @@ def summarize_outcomes(outcomes: list[dict]) -> str:
     )
 
     content = response.choices[0].message.content if response.choices else None
-    return content or "Unable to generate summary."
+    if not content:
+        return "Unable to generate summary."
+    _summary_cache[key] = content
+    return content
@@ -1,29 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 import uvicorn
 
-from db import get_client, summarize_outcomes
+from db import Neo4jClient, get_client, summarize_outcomes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    client = get_client()
+    await client.driver.verify_connectivity()
+    try:
+        await client.ensure_indexes()
+    except Exception as e:
+        print(f"Index creation error: {e}")
+    yield
+    await client.close()
+
 
-app = FastAPI(title="QoG Dashboard")
+app = FastAPI(title="QoG Dashboard", lifespan=lifespan)
 templates = Jinja2Templates(directory="templates")
 
 
+async def _outcome_summary(client: Neo4jClient) -> str | None:
+    outcomes = await client.get_outcomes_for_summary()
+    try:
+        return await summarize_outcomes(outcomes)
+    except Exception as e:
+        print(f"LLM summary error: {e}")
+        return None
+
+
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     client = get_client()
-    summary = client.get_dashboard_summary()
-    contribution_split = client.get_contribution_split()
-    decisions = client.get_decisions_by_type(per_type=2)
-    people = client.get_people_with_stats()
-    agents = client.get_agents_with_stats()
-    
-    outcomes = client.get_outcomes_for_summary()
+    summary_task = asyncio.create_task(_outcome_summary(client))
     try:
-        outcome_summary = summarize_outcomes(outcomes)
-    except Exception as e:
-        print(f"LLM summary error: {e}")
-        outcome_summary = None
+        summary, contribution_split, decisions, contributors = await asyncio.gather(
+            client.get_dashboard_summary(),
+            client.get_contribution_split(),
+            client.get_decisions_by_type(per_type=2),
+            client.get_contributors_with_stats(),
+        )
+    except BaseException:
+        summary_task.cancel()
+        raise
+    outcome_summary = await summary_task
     
     return templates.TemplateResponse(
         "dashboard.html",
@@ -32,8 +57,8 @@ async def dashboard(request: Request):
             "summary": summary,
             "split": contribution_split,
             "decisions": decisions,
-            "people": people,
-            "agents": agents,
+            "people": contributors["people"],
+            "agents": contributors["agents"],
             "outcome_summary": outcome_summary,
         }
     )